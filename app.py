@@ -1,27 +1,55 @@
 #!/usr/bin/env python3
+import asyncio
 import os
+import queue
 import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
 import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any
+import csv
+import gzip
 import hashlib
+import hmac
 import json
 import io
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import orjson
+from sentence_transformers import SentenceTransformer
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+from fastapi import BackgroundTasks, FastAPI, File, UploadFile, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 import uvicorn
-import PyPDF2
+import openpyxl
+import pymupdf
 from docx import Document
 
-# Initialize the application
-app = FastAPI(title="SolAI")
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+except ImportError:
+    ORTModelForFeatureExtraction = None
+
+# Initialize the application; orjson serializes every JSON response
+app = FastAPI(title="SolAI", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -32,8 +60,294 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Password for upload access
+# Frontend assets (stylesheet and script split out of index.html)
+app.mount("/static", StaticFiles(directory="static"), name="static")
+
+
+@app.middleware("http")
+async def cache_static_assets(request: Request, call_next):
+    """Let clients cache /static responses; repeat page loads then skip
+    the asset requests entirely"""
+    response = await call_next(request)
+    if request.url.path.startswith("/static/"):
+        response.headers.setdefault("Cache-Control", "public, max-age=86400")
+    return response
+
+# Password for upload access; only its digest is kept around for the
+# constant-time comparison below
 UPLOAD_PASSWORD = "Henley@2003"
+_UPLOAD_PW_DIGEST = hashlib.sha256(UPLOAD_PASSWORD.encode()).digest()
+
+
+def verify_upload_password(password: str) -> bool:
+    """Constant-time check of the upload password"""
+    candidate = hashlib.sha256((password or '').encode()).digest()
+    return hmac.compare_digest(candidate, _UPLOAD_PW_DIGEST)
+
+# Longest question we will embed; matches the frontend textarea maxlength
+MAX_QUESTION_LENGTH = 4000
+
+# Longest excerpt of a retrieved chunk quoted back in an answer
+SNIPPET_LENGTH = 400
+
+# How many chunks retrieval returns per question
+SEARCH_TOP_K = 3
+
+# Lexical prefilter for vector search: score only the chunks FTS5 finds
+# for the question, up to this many; with fewer than the minimum the
+# filter is assumed too narrow and the full matrix is scanned instead
+FTS_PREFILTER_LIMIT = 200
+FTS_PREFILTER_MIN_HITS = 5
+
+# Questions this short with no indexed term ("hi", "thanks") skip
+# retrieval; anything longer always reaches the semantic scan
+FAST_REJECT_MAX_TOKENS = 3
+
+# Read uploads in fixed-size chunks rather than one whole-body read
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Frontend page and how long clients may cache it
+INDEX_HTML = "index.html"
+INDEX_MAX_AGE = 86400
+
+
+def precompress_index() -> Dict[str, bytes]:
+    """Read and precompress index.html once at startup, keyed by encoding"""
+    with open(INDEX_HTML, "rb") as f:
+        raw = f.read()
+    cache = {"identity": raw, "gzip": gzip.compress(raw, compresslevel=9)}
+    if brotli is not None:
+        cache["br"] = brotli.compress(raw, quality=11)
+    return cache
+
+
+INDEX_CACHE = precompress_index()
+INDEX_ETAG = hashlib.md5(INDEX_CACHE["identity"]).hexdigest()
+
+# Embedding model settings
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+EMBEDDING_BATCH_SIZE = 64
+
+# Directory holding an ONNX export of the embedding model, produced once with
+#   optimum-cli export onnx -m sentence-transformers/all-MiniLM-L6-v2 minilm-onnx
+# (optionally quantized via ORTQuantizer with the avx512_vnni config)
+ONNX_MODEL_DIR = os.environ.get('ONNX_MODEL_DIR', 'minilm-onnx')
+
+# Chunk windows are sized in model tokens; MiniLM embeds at most 256
+# tokens, so larger windows would be silently truncated
+CHUNK_TOKENS = 256
+CHUNK_OVERLAP_TOKENS = 32
+
+# Append-only sidecar holding all chunk vectors as one contiguous
+# (N, EMBEDDING_DIM) int8 matrix; row order matches chunks.id order
+EMBEDDINGS_FILE = 'embeddings.i8'
+
+# SQLite database holding documents, chunks, and chat history
+DB_FILE = 'knowledge_chatbot.db'
+
+# Hot-path insert statements, defined once so sqlite3's per-connection
+# statement cache always hits the same prepared plan
+INSERT_DOCUMENT_SQL = '''
+    INSERT INTO documents (id, filename, file_type, file_size, content_hash, content_text, upload_date, chunk_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_CHUNK_SQL = 'INSERT INTO chunks (doc_id, ord, text, scale) VALUES (?, ?, ?, ?)'
+INSERT_CHAT_SQL = '''
+    INSERT INTO chat_history (id, session_id, question, answer, sources, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+def connect_db() -> sqlite3.Connection:
+    """Open a database connection with the tuned pragmas applied.
+
+    WAL mode persists in the database file, but synchronous, cache and
+    temp_store settings are per-connection, so they run on every open.
+    """
+    conn = sqlite3.connect(DB_FILE)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-20000')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    return conn
+
+
+_local = threading.local()
+
+
+def fts_escape(query: str) -> str:
+    """Quote each token so user text cannot inject FTS5 query syntax"""
+    return ' '.join('"' + token.replace('"', '""') + '"' for token in query.split())
+
+
+# Document bodies compress 3-5x with zstd; search never reads them (FTS
+# and the chunk table hold the working text), so they only pay the
+# decompress cost on the rare legacy-backfill path
+if zstandard is not None:
+    _zstd_compress = zstandard.ZstdCompressor(level=3)
+    _zstd_decompress = zstandard.ZstdDecompressor()
+
+
+def compress_text(text: str):
+    """Compress a document body for storage; passthrough without zstd"""
+    if zstandard is None:
+        return text
+    return _zstd_compress.compress(text.encode('utf-8'))
+
+
+def decompress_text(value) -> str:
+    """Read a stored body, whether compressed bytes or a legacy string"""
+    if isinstance(value, bytes):
+        if zstandard is None:
+            raise RuntimeError("stored document body is zstd-compressed "
+                               "but the zstandard package is not installed")
+        return _zstd_decompress.decompress(value).decode('utf-8')
+    return value
+
+
+def get_db() -> sqlite3.Connection:
+    """Return this thread's cached database connection.
+
+    Opening a connection per call pays file-open and page-cache warmup
+    costs on every request; one connection per thread amortizes them.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = connect_db()
+        _local.conn = conn
+    return conn
+
+class OnnxEncoder:
+    """MiniLM encoder backed by ONNX Runtime.
+
+    Exposes the same encode()/tokenizer surface the rest of the app uses
+    from SentenceTransformer, but runs the forward pass through an
+    onnxruntime session (int8-quantized when the export was quantized).
+    """
+
+    def __init__(self, model_dir: str):
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, provider='CPUExecutionProvider')
+
+    def encode(self, texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE,
+               normalize_embeddings: bool = True, convert_to_numpy: bool = True,
+               show_progress_bar: bool = False) -> np.ndarray:
+        pooled = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            encoded = self.tokenizer(batch, padding=True, truncation=True,
+                                     max_length=CHUNK_TOKENS, return_tensors='np')
+            hidden = self.session(**encoded).last_hidden_state
+            # Mean-pool over real tokens only
+            mask = encoded['attention_mask'][..., None].astype(np.float32)
+            pooled.append((hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9))
+
+        embeddings = np.vstack(pooled).astype(np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        return embeddings
+
+
+def load_encoder():
+    """Prefer the ONNX Runtime export when present, else eager PyTorch"""
+    if ORTModelForFeatureExtraction is not None and os.path.isdir(ONNX_MODEL_DIR):
+        return OnnxEncoder(ONNX_MODEL_DIR)
+    model = SentenceTransformer(EMBEDDING_MODEL)
+    if os.environ.get("EMBEDDING_BF16"):
+        # Halves weight memory and, on CPUs with BF16 FMA support, the
+        # forward pass cost; opt-in since older CPUs emulate bf16 slowly
+        import torch
+        model = model.to(torch.bfloat16)
+    return model
+
+
+class EmbeddingBatcher:
+    """Fold concurrent query embeddings into one model forward pass.
+
+    Callers enqueue (text, Future) pairs and block on the Future; a
+    background worker drains the queue for up to max_wait seconds or
+    max_batch entries, encodes the batch in a single call, and fulfills
+    each Future. Under concurrent /chat load the encoder amortizes its
+    per-call overhead across the whole batch.
+    """
+
+    def __init__(self, encode_fn, max_batch: int = 32, max_wait: float = 0.02):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self):
+        """Start the drain thread in the current process on first use.
+
+        Threads do not survive fork: with gunicorn's preload_app the
+        batcher is built in the master, and a thread started there would
+        leave every forked worker enqueueing into a queue nobody drains.
+        Tracking the pid restarts the thread per process instead.
+        """
+        if self._worker_pid != os.getpid():
+            with self._start_lock:
+                if self._worker_pid != os.getpid():
+                    threading.Thread(target=self._worker, daemon=True).start()
+                    self._worker_pid = os.getpid()
+
+    def encode(self, text: str) -> np.ndarray:
+        self._ensure_worker()
+        future = Future()
+        self.requests.put((text, future))
+        return future.result()
+
+    def _worker(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                embeddings = self.encode_fn([text for text, _ in batch])
+                for (_, future), embedding in zip(batch, embeddings):
+                    future.set_result(embedding)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+# PDFs below this page count are extracted serially; forking and
+# pickling costs more than it saves on small documents
+PDF_PARALLEL_MIN_PAGES = 10
+
+_pdf_pool = None
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared page-extraction worker pool"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _pdf_pool
+
+
+def _pdf_page_text(args) -> str:
+    """Extract one page's text in a worker process"""
+    path, index = args
+    with pymupdf.open(path) as pdf:
+        return pdf[index].get_text("text")
+
 
 # Initialize components
 class KnowledgeBase:
@@ -41,13 +355,27 @@ class KnowledgeBase:
         self.init_database()
         self.documents = []
         self.document_metadata = []
-        self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-        self.tfidf_matrix = None
+        # chunks.id -> row in the embedding matrix, for FTS prefiltering
+        self.chunk_row_by_id: Dict[int, int] = {}
+        # Every term the FTS index knows; short questions sharing none
+        # of them skip retrieval outright
+        self.indexed_terms: set = set()
+        self.model = load_encoder()
+        self.embedding_q = None
+        self.embedding_scales = None
+        # Bumped on every ingest; keys the /chat search cache
+        self.version = 0
+        # Serializes background ingest jobs mutating the index
+        self.ingest_lock = threading.Lock()
+        self.query_batcher = EmbeddingBatcher(self.embed_texts)
+        # Repeated questions skip the encoder entirely; unlike the
+        # result cache this stays valid across corpus changes
+        self.encode_query = lru_cache(maxsize=4096)(self.query_batcher.encode)
         self.load_existing_documents()
     
     def init_database(self):
         """Initialize SQLite database for metadata"""
-        conn = sqlite3.connect('knowledge_chatbot.db')
+        conn = connect_db()
         cursor = conn.cursor()
         
         # Documents table
@@ -64,6 +392,70 @@ class KnowledgeBase:
             )
         ''')
         
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='chunks'")
+        if cursor.fetchone():
+            cursor.execute('PRAGMA table_info(chunks)')
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'scale' not in columns:
+                # Pre-quantization layout; the startup backfill re-embeds it
+                cursor.execute('DROP TABLE chunks')
+            elif 'emb' in columns:
+                # Move per-row vector blobs into the contiguous sidecar
+                # file; SQLite keeps only chunk metadata and text
+                cursor.execute('SELECT emb FROM chunks ORDER BY id')
+                blobs = cursor.fetchall()
+                with open(EMBEDDINGS_FILE, 'wb') as f:
+                    for (emb,) in blobs:
+                        f.write(emb)
+                cursor.execute('ALTER TABLE chunks DROP COLUMN emb')
+
+        # Chunk metadata table; the vectors live row-aligned in EMBEDDINGS_FILE
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                doc_id TEXT NOT NULL,
+                ord INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                scale REAL NOT NULL
+            )
+        ''')
+
+        # Full-text index over chunk text, kept in sync by triggers
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='chunks_fts'")
+        fts_existed = cursor.fetchone() is not None
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                text, content='chunks', content_rowid='id'
+            )
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+                INSERT INTO chunks_fts(rowid, text) VALUES (new.id, new.text);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+                INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
+                INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                INSERT INTO chunks_fts(rowid, text) VALUES (new.id, new.text);
+            END
+        ''')
+        if not fts_existed:
+            # One-time backfill for chunks inserted before the index existed
+            cursor.execute("INSERT INTO chunks_fts(chunks_fts) VALUES('rebuild')")
+
+        # Raw upload digests for skipping duplicate files before parsing
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                doc_id TEXT NOT NULL
+            )
+        ''')
+
         # Chat history table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS chat_history (
@@ -76,91 +468,251 @@ class KnowledgeBase:
             )
         ''')
         
+        # Range-and-order queries hit these instead of scan+sort
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_chat_sess_ts
+            ON chat_history(session_id, timestamp)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_docs_upload
+            ON documents(upload_date DESC)
+        ''')
+        # Vocabulary view over the FTS index; read at startup to seed
+        # the fast-reject term set
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_vocab
+            USING fts5vocab(chunks_fts, 'row')
+        ''')
+        # Covering index for the /documents listing: every projected
+        # column lives in the index, so the query never touches the
+        # table (and its large content_text column) at all
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_docs_list
+            ON documents(upload_date DESC, id, filename, file_type, file_size, chunk_count)
+        ''')
+
         conn.commit()
         conn.close()
-    
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts into L2-normalized vectors"""
+        return self.model.encode(
+            texts,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype(np.float32)
+
+    def lookup_blob(self, digest: str):
+        """Return the doc_id already stored for this raw-file digest, if any"""
+        cursor = get_db().cursor()
+        cursor.execute('SELECT doc_id FROM blobs WHERE hash = ?', (digest,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def register_blob(self, digest: str, doc_id: str):
+        """Remember a raw-file digest so re-uploads can be short-circuited"""
+        conn = get_db()
+        conn.execute('INSERT OR IGNORE INTO blobs (hash, doc_id) VALUES (?, ?)', (digest, doc_id))
+        conn.commit()
+
+    def quantize_embeddings(self, vectors: np.ndarray):
+        """Quantize float vectors to int8 with a per-vector scale"""
+        scales = np.max(np.abs(vectors), axis=1, keepdims=True) / 127.0
+        scales = np.where(scales == 0, 1.0, scales)
+        quantized = np.round(vectors / scales).astype(np.int8)
+        return quantized, scales.astype(np.float32).ravel()
+
+    def append_embeddings(self, quantized: np.ndarray):
+        """Append quantized vectors to the sidecar matrix file"""
+        with open(EMBEDDINGS_FILE, 'ab') as f:
+            f.write(np.ascontiguousarray(quantized).tobytes())
+
+    def map_embeddings(self):
+        """(Re)map the contiguous embedding matrix from the sidecar file"""
+        size = os.path.getsize(EMBEDDINGS_FILE) if os.path.exists(EMBEDDINGS_FILE) else 0
+        count = size // EMBEDDING_DIM
+        if count == 0:
+            self.embedding_q = None
+            return
+        self.embedding_q = np.memmap(EMBEDDINGS_FILE, dtype=np.int8, mode='r',
+                                     shape=(count, EMBEDDING_DIM))
+
     def load_existing_documents(self):
-        """Load existing documents from database"""
-        conn = sqlite3.connect('knowledge_chatbot.db')
+        """Load existing chunks and their cached embeddings from database"""
+        conn = get_db()
         cursor = conn.cursor()
-        cursor.execute('SELECT * FROM documents')
-        documents = cursor.fetchall()
-        conn.close()
-        
+        cursor.execute('SELECT id, filename, content_hash FROM documents')
+        doc_info = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        # Re-embed legacy documents that predate the chunks table
+        cursor.execute('SELECT DISTINCT doc_id FROM chunks')
+        embedded_ids = {row[0] for row in cursor.fetchall()}
+        for doc_id in doc_info:
+            if doc_id not in embedded_ids:
+                cursor.execute('SELECT content_text FROM documents WHERE id = ?', (doc_id,))
+                chunks = self.chunk_text(decompress_text(cursor.fetchone()[0]))
+                if chunks:
+                    quantized, scales = self.quantize_embeddings(self.embed_texts(chunks))
+                    cursor.executemany(
+                        'INSERT INTO chunks (doc_id, ord, text, scale) VALUES (?, ?, ?, ?)',
+                        [(doc_id, i, chunk, float(scales[i]))
+                         for i, chunk in enumerate(chunks)]
+                    )
+                    self.append_embeddings(quantized)
+        conn.commit()
+
+        # Row order must match the sidecar matrix, so sort by insert order
+        cursor.execute('SELECT id, doc_id, ord, text, scale FROM chunks ORDER BY id')
+        rows = cursor.fetchall()
+
         self.documents = []
         self.document_metadata = []
-        
-        for doc in documents:
-            doc_id, filename, file_type, file_size, content_hash, content_text, upload_date, chunk_count = doc
-            # Split content into chunks if it's large
-            chunks = self.chunk_text(content_text)
-            for i, chunk in enumerate(chunks):
-                self.documents.append(chunk)
-                self.document_metadata.append({
-                    "file_id": doc_id,
-                    "filename": filename,
-                    "chunk_index": i,
-                    "content_hash": content_hash
-                })
-        
-        # Update TF-IDF matrix if we have documents
-        if self.documents:
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.documents)
+        self.chunk_row_by_id = {}
+        scales = []
+
+        for chunk_id, doc_id, ord_, text, scale in rows:
+            filename, content_hash = doc_info.get(doc_id, ("", ""))
+            self.chunk_row_by_id[chunk_id] = len(self.documents)
+            self.documents.append(text)
+            self.document_metadata.append({
+                "file_id": doc_id,
+                "filename": filename,
+                "chunk_index": ord_,
+                "content_hash": content_hash
+            })
+            scales.append(scale)
+
+        self.embedding_scales = np.asarray(scales, dtype=np.float32)
+        self.map_embeddings()
+        self.refresh_indexed_terms()
+
+    def refresh_indexed_terms(self):
+        """Rebuild the fast-reject set from the FTS vocabulary"""
+        cursor = get_db().cursor()
+        cursor.execute('SELECT term FROM chunks_vocab')
+        self.indexed_terms = {row[0] for row in cursor}
+
+    def _fts_tokens(self, question: str) -> List[str]:
+        """Tokenize a question the way unicode61 indexes the corpus.
+
+        FTS5's default tokenizer strips diacritics, so "café" is indexed
+        as "cafe"; NFKD-decomposing and dropping combining marks here
+        keeps the fast-reject set comparable to the vocabulary.
+        """
+        normalized = unicodedata.normalize('NFKD', question.lower())
+        stripped = ''.join(c for c in normalized if not unicodedata.combining(c))
+        return re.findall(r'\w+', stripped)
+
+    def should_skip_retrieval(self, question: str) -> bool:
+        """Fast-reject short greeting-style questions with no indexed term.
+
+        Only inputs of up to FAST_REJECT_MAX_TOKENS tokens are eligible:
+        longer questions always reach the semantic scan, since matching
+        despite a vocabulary mismatch ("automobile" against a corpus
+        about "cars") is exactly what the embeddings are for.
+        """
+        tokens = self._fts_tokens(question)
+        if not tokens:
+            return True
+        if len(tokens) > FAST_REJECT_MAX_TOKENS or not self.indexed_terms:
+            return False
+        return not any(token in self.indexed_terms for token in tokens)
     
-    def chunk_text(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
-        """Split text into overlapping chunks"""
-        words = text.split()
-        if not words:
+    def chunk_text(self, text: str, chunk_size: int = CHUNK_TOKENS, overlap: int = CHUNK_OVERLAP_TOKENS) -> List[str]:
+        """Split text into overlapping windows of model tokens"""
+        # Tokenize the whole document once with the model's Rust
+        # tokenizer; windows are then cheap slices over the id list
+        ids = self.model.tokenizer(text, add_special_tokens=False, truncation=False)["input_ids"]
+        if not ids:
             return []
-            
-        chunks = []
-        
-        for i in range(0, len(words), chunk_size - overlap):
-            chunk = words[i:i + chunk_size]
-            if chunk:
-                chunks.append(" ".join(chunk))
-            
-            if i + chunk_size >= len(words):
+
+        windows = []
+        for start in range(0, len(ids), chunk_size - overlap):
+            windows.append(ids[start:start + chunk_size])
+            if start + chunk_size >= len(ids):
                 break
-                
-        return chunks if chunks else [text]
+
+        # Decoding happens in one batched native call, the only step that
+        # touches the text again
+        return self.model.tokenizer.batch_decode(windows, skip_special_tokens=True)
     
-    async def process_file(self, file_content: bytes, filename: str) -> str:
+    def _extract_plain(self, file_content: bytes) -> str:
+        try:
+            return file_content.decode('utf-8')
+        except:
+            return file_content.decode('latin-1')
+
+    def _extract_csv(self, file_content: bytes) -> str:
+        decoded = self._extract_plain(file_content)
+        # Stream rows straight into the join; no row list is built
+        return "\n".join("\t".join(row) for row in csv.reader(io.StringIO(decoded)))
+
+    def _extract_pdf(self, file_content: bytes) -> str:
+        with pymupdf.open(stream=file_content, filetype='pdf') as pdf:
+            # Small documents are not worth the fork/pickle overhead of
+            # the worker pool
+            if pdf.page_count < PDF_PARALLEL_MIN_PAGES:
+                return "\n".join(page.get_text("text") for page in pdf)
+            page_count = pdf.page_count
+
+        # pymupdf documents cannot cross process boundaries, so spill the
+        # bytes to a temp file and let each worker open its own handle
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tf:
+            tf.write(file_content)
+            temp_path = tf.name
+        try:
+            pages = get_pdf_pool().map(
+                _pdf_page_text,
+                [(temp_path, i) for i in range(page_count)],
+                chunksize=4
+            )
+            return "\n".join(pages)
+        finally:
+            os.unlink(temp_path)
+
+    def _extract_xlsx(self, file_content: bytes) -> str:
+        # read_only streams rows through openpyxl's SAX path and frees
+        # them as it goes instead of building cell objects for the whole
+        # workbook
+        workbook = openpyxl.load_workbook(io.BytesIO(file_content),
+                                          data_only=True, read_only=True)
+        try:
+            parts = []
+            for sheet in workbook.worksheets:
+                for row in sheet.iter_rows(values_only=True):
+                    cells = [str(cell) for cell in row if cell is not None]
+                    if cells:
+                        parts.append("\t".join(cells))
+            return "\n".join(parts)
+        finally:
+            workbook.close()
+
+    def _extract_docx(self, file_content: bytes) -> str:
+        doc = Document(io.BytesIO(file_content))
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs if paragraph.text)
+
+    # Extension dispatch: one splitext call and an O(1) lookup instead of
+    # a chain of lowered-filename comparisons
+    _HANDLERS = {
+        '.txt': _extract_plain,
+        '.md': _extract_plain,
+        '.json': _extract_plain,
+        '.csv': _extract_csv,
+        '.pdf': _extract_pdf,
+        '.xlsx': _extract_xlsx,
+        '.docx': _extract_docx,
+        '.doc': _extract_docx,
+    }
+
+    def process_file(self, file_content: bytes, filename: str) -> str:
         """Process different file types and extract text"""
-        file_extension = filename.split('.')[-1].lower()
-        
+        extension = os.path.splitext(filename)[1].lower()
+        handler = self._HANDLERS.get(extension, KnowledgeBase._extract_plain)
+
         try:
-            if file_extension in ['txt', 'md', 'csv', 'json']:
-                try:
-                    return file_content.decode('utf-8')
-                except:
-                    return file_content.decode('latin-1')
-            
-            elif file_extension == 'pdf':
-                text = ""
-                pdf_file = io.BytesIO(file_content)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text
-            
-            elif file_extension in ['docx', 'doc']:
-                doc_file = io.BytesIO(file_content)
-                doc = Document(doc_file)
-                text = ""
-                for paragraph in doc.paragraphs:
-                    if paragraph.text:
-                        text += paragraph.text + "\n"
-                return text
-            
-            else:
-                try:
-                    return file_content.decode('utf-8')
-                except:
-                    return file_content.decode('latin-1')
-                    
+            return handler(self, file_content)
         except Exception as e:
             return f"Error processing file {filename}: {str(e)}"
     
@@ -173,41 +725,50 @@ class KnowledgeBase:
         content_hash = hashlib.md5(text_content.encode()).hexdigest()
         
         # Check if content already exists
-        conn = sqlite3.connect('knowledge_chatbot.db')
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute('SELECT id FROM documents WHERE content_hash = ?', (content_hash,))
         existing = cursor.fetchone()
-        
+
         if existing:
-            conn.close()
             return False
-        
+
         # Split into chunks
         chunks = self.chunk_text(text_content)
-        
+
         if not chunks:
-            conn.close()
             return False
         
-        # Save to database
-        cursor.execute('''
-            INSERT INTO documents (id, filename, file_type, file_size, content_hash, content_text, upload_date, chunk_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            file_id, 
-            filename, 
-            filename.split('.')[-1].lower(),
-            len(text_content.encode('utf-8')),
-            content_hash,
-            text_content,
-            datetime.now().isoformat(),
-            len(chunks)
-        ))
-        
-        conn.commit()
-        conn.close()
-        
-        # Add to in-memory storage for TF-IDF
+        # Embed each chunk exactly once, at upload time
+        quantized, scales = self.quantize_embeddings(self.embed_texts(chunks))
+
+        # Save to database: document row plus all chunk rows in one
+        # explicit transaction, so there is a single fsync per upload
+        with conn:
+            conn.execute(INSERT_DOCUMENT_SQL, (
+                file_id,
+                filename,
+                filename.split('.')[-1].lower(),
+                len(text_content.encode('utf-8')),
+                content_hash,
+                compress_text(text_content),
+                datetime.now().isoformat(),
+                len(chunks)
+            ))
+            conn.executemany(
+                INSERT_CHUNK_SQL,
+                [(file_id, i, chunk, float(scales[i]))
+                 for i, chunk in enumerate(chunks)]
+            )
+
+        # AUTOINCREMENT hands the new chunks consecutive ids and ingest
+        # is serialized, so the rowid -> matrix-row map extends in step
+        cursor.execute('SELECT max(id) FROM chunks')
+        last_id = cursor.fetchone()[0]
+        for offset, chunk_id in enumerate(range(last_id - len(chunks) + 1, last_id + 1)):
+            self.chunk_row_by_id[chunk_id] = len(self.documents) + offset
+
+        # Add to in-memory storage for vector search
         for i, chunk in enumerate(chunks):
             self.documents.append(chunk)
             self.document_metadata.append({
@@ -216,50 +777,143 @@ class KnowledgeBase:
                 "chunk_index": i,
                 "content_hash": content_hash
             })
-        
-        # Update TF-IDF matrix
-        if self.documents:
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.documents)
-        
+
+        self.append_embeddings(quantized)
+        self.map_embeddings()
+        if self.embedding_scales is None or len(self.embedding_scales) == 0:
+            self.embedding_scales = scales
+        else:
+            self.embedding_scales = np.concatenate([self.embedding_scales, scales])
+
+        self.refresh_indexed_terms()
+        self.version += 1
+
         return True
     
-    def search_similar_content(self, query: str, n_results: int = 3) -> Dict[str, Any]:
-        """Search for similar content using TF-IDF and cosine similarity"""
-        if not self.documents or self.tfidf_matrix is None:
+    def search_keyword(self, query: str, n_results: int = SEARCH_TOP_K) -> Dict[str, Any]:
+        """Full-text search over chunk text via the FTS5 index"""
+        match = fts_escape(query)
+        if not match:
             return {'documents': [], 'metadatas': [], 'scores': []}
-        
+
+        cursor = get_db().cursor()
+        cursor.execute('''
+            SELECT c.text, c.doc_id, c.ord, d.filename, d.content_hash,
+                   bm25(chunks_fts) AS rank
+            FROM chunks_fts f
+            JOIN chunks c ON c.id = f.rowid
+            JOIN documents d ON d.id = c.doc_id
+            WHERE chunks_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ''', (match, n_results))
+        rows = cursor.fetchall()
+
+        return {
+            'documents': [row[0] for row in rows],
+            'metadatas': [{
+                "file_id": row[1],
+                "filename": row[3],
+                "chunk_index": row[2],
+                "content_hash": row[4]
+            } for row in rows],
+            # bm25() returns lower-is-better; negate so scores rank like
+            # the cosine path
+            'scores': [-row[5] for row in rows]
+        }
+
+    def prefilter_candidates(self, query: str):
+        """Use the FTS5 index to narrow vector search to lexical matches.
+
+        Returns the matrix rows of up to FTS_PREFILTER_LIMIT chunks that
+        share a term with the query, or None when the match set is too
+        small to trust (rare or misspelled terms), in which case the
+        caller scans the full matrix.
+        """
+        # OR the quoted tokens: any shared term keeps a chunk in the
+        # candidate set, unlike the implicit-AND used for exact search
+        tokens = [fts_escape(token) for token in query.split()]
+        if not tokens:
+            return None
+
+        cursor = get_db().cursor()
+        cursor.execute(
+            'SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? LIMIT ?',
+            (' OR '.join(tokens), FTS_PREFILTER_LIMIT)
+        )
+        rows = [self.chunk_row_by_id[r[0]] for r in cursor
+                if r[0] in self.chunk_row_by_id]
+        if len(rows) < FTS_PREFILTER_MIN_HITS:
+            return None
+        return np.asarray(rows)
+
+    def search_similar_content(self, query: str, n_results: int = SEARCH_TOP_K) -> Dict[str, Any]:
+        """Search for similar content using the precomputed chunk embeddings"""
+        if not self.documents or self.embedding_q is None:
+            return {'documents': [], 'metadatas': [], 'scores': []}
+
         try:
-            # Transform query to TF-IDF
-            query_vec = self.vectorizer.transform([query])
-            
-            # Calculate cosine similarities
-            similarities = cosine_similarity(query_vec, self.tfidf_matrix).flatten()
-            
-            # Get top N results
-            top_indices = similarities.argsort()[-n_results:][::-1]
-            
+            # Embed and quantize the query the same way as the chunks;
+            # the scaled integer dot product recovers the cosine similarity.
+            # Concurrent queries are folded into one forward pass.
+            query_vec = self.encode_query(query)[None, :]
+            query_q, query_scale = self.quantize_embeddings(query_vec)
+
+            # Let the FTS index cut the candidate set before any vector
+            # math; when it matches enough chunks only those matrix rows
+            # are scored, otherwise the full matrix is scanned
+            candidates = self.prefilter_candidates(query)
+            if candidates is not None:
+                matrix = self.embedding_q[candidates]
+                scales = self.embedding_scales[candidates]
+            else:
+                matrix = self.embedding_q
+                scales = self.embedding_scales
+
+            raw = matrix.astype(np.int32) @ query_q[0].astype(np.int32)
+            similarities = raw.astype(np.float32) * scales * query_scale[0]
+
+            # Get top N results; argpartition selects them in O(N) and
+            # only the n_results winners are actually sorted
+            if n_results < len(similarities):
+                top = np.argpartition(similarities, -n_results)[-n_results:]
+                top_indices = top[np.argsort(similarities[top])[::-1]]
+            else:
+                top_indices = similarities.argsort()[::-1]
+
+            scores = [float(similarities[i]) for i in top_indices]
+            if candidates is not None:
+                # Map positions in the candidate subset back to matrix rows
+                top_indices = candidates[top_indices]
+
             results = {
                 'documents': [self.documents[i] for i in top_indices],
                 'metadatas': [self.document_metadata[i] for i in top_indices],
-                'scores': [float(similarities[i]) for i in top_indices]
+                'scores': scores
             }
-            
+
             return results
         except Exception as e:
             print(f"Search error: {e}")
-            return {'documents': [], 'metadatas': [], 'scores': []}
+            # Degrade to the keyword index rather than returning nothing
+            return self.search_keyword(query, n_results)
     
     def generate_answer(self, question: str, context: str) -> str:
         """Generate answer based on question and context"""
         if not context or "no relevant" in context.lower() or "error" in context.lower():
             return "I don't have enough information in my knowledge base to answer this question accurately. Please upload relevant documents first."
         
-        context_lines = context.split('\n')
+        # Quote fixed-size snippets rather than whole retrieved chunks so
+        # the response stays small no matter how large the chunks are
+        context_lines = [
+            line if len(line) <= SNIPPET_LENGTH else line[:SNIPPET_LENGTH] + "…"
+            for line in context.split('\n') if line.strip()
+        ]
         if len(context_lines) > 3:
             context_preview = '\n'.join(context_lines[:3]) + "\n..."
         else:
-            context_preview = context
-            
+            context_preview = '\n'.join(context_lines)
+
         return f"""Based on your documents:
 
 {context_preview}
@@ -269,111 +923,246 @@ I found this information relevant to your question. The system searches through
     def save_chat_message(self, session_id: str, question: str, answer: str, sources: List[Dict] = None):
         """Save chat message to database"""
         chat_id = str(uuid.uuid4())
-        
-        conn = sqlite3.connect('knowledge_chatbot.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO chat_history (id, session_id, question, answer, sources, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            chat_id,
-            session_id,
-            question,
-            answer,
-            json.dumps(sources) if sources else None,
-            datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        conn.close()
+
+        # One implicit transaction, one commit
+        conn = get_db()
+        with conn:
+            conn.execute(INSERT_CHAT_SQL, (
+                chat_id,
+                session_id,
+                question,
+                answer,
+                json.dumps(sources) if sources else None,
+                datetime.now().isoformat()
+            ))
 
 # Global knowledge base instance
 kb = KnowledgeBase()
 
+
+@lru_cache(maxsize=2048)
+def _search_cached(version: int, query: str) -> Dict[str, Any]:
+    """Memoize search results per normalized query; the version argument
+    invalidates every entry when the corpus changes"""
+    return kb.search_similar_content(query)
+
 @app.get("/")
-async def read_root():
-    with open("index.html", "r", encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
+async def read_root(request: Request):
+    # Vary tells shared caches the body differs per Accept-Encoding, so
+    # a brotli response is never replayed to a gzip-only client
+    headers = {
+        "Cache-Control": f"public, max-age={INDEX_MAX_AGE}",
+        "ETag": INDEX_ETAG,
+        "Vary": "Accept-Encoding",
+    }
+
+    if request.headers.get("if-none-match") == INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+
+    # Pick the smallest representation the client accepts; every variant
+    # lives in memory so no request touches the disk
+    accept_encoding = request.headers.get("accept-encoding", "")
+    encoding = "identity"
+    if "br" in INDEX_CACHE and "br" in accept_encoding:
+        encoding = "br"
+    elif "gzip" in accept_encoding:
+        encoding = "gzip"
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return HTMLResponse(content=INDEX_CACHE[encoding], headers=headers)
+
+# Ingest job registry (job_id == file_id); jobs run in the request
+# worker pool after the response is sent. Finished entries are evicted
+# when /status reports them; the cap catches jobs nobody ever polls.
+upload_jobs: Dict[str, Dict[str, str]] = {}
+MAX_TRACKED_JOBS = 256
+
+
+def _ingest_job(job_id: str, filename: str, content: bytes, digest: str):
+    """Parse, chunk and embed an upload in the background"""
+    try:
+        with kb.ingest_lock:
+            text_content = kb.process_file(content, filename)
+            success = kb.add_document_to_knowledge(job_id, filename, text_content)
+        if success:
+            kb.register_blob(digest, job_id)
+            upload_jobs[job_id] = {"status": "done",
+                                   "message": f"File '{filename}' uploaded and processed successfully"}
+        else:
+            upload_jobs[job_id] = {"status": "done",
+                                   "message": f"File '{filename}' was already in the knowledge base"}
+    except Exception as e:
+        upload_jobs[job_id] = {"status": "failed", "message": str(e)}
+
 
 @app.post("/upload")
-async def upload_file(file: UploadFile = File(...), password: str = Form(...)):
+async def upload_file(background_tasks: BackgroundTasks, file: UploadFile = File(...), password: str = Form(...)):
     try:
         # Verify password
-        if password != UPLOAD_PASSWORD:
+        if not verify_upload_password(password):
             raise HTTPException(status_code=403, detail="Invalid upload password")
         
         # Generate unique file ID
         file_id = str(uuid.uuid4())
         
-        # Read file content
-        content = await file.read()
-        
-        # Process file
-        text_content = await kb.process_file(content, file.filename)
-        
-        # Add to knowledge base
-        success = kb.add_document_to_knowledge(file_id, file.filename, text_content)
-        
-        if success:
-            return {"message": f"File '{file.filename}' uploaded and processed successfully", "file_id": file_id}
-        else:
-            return {"message": f"File '{file.filename}' was already in the knowledge base", "file_id": file_id}
-    
+        # Read file content in streaming chunks so large uploads are not
+        # materialized twice by one oversized read() call; hash the raw
+        # bytes in the same pass for duplicate detection
+        hasher = hashlib.sha256(usedforsecurity=False)
+        buffer = bytearray()
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            buffer.extend(chunk)
+        content = bytes(buffer)
+        # Release the spooled upload (possibly an on-disk temp file) now
+        # that the bytes are in memory; parsers never re-read it
+        await file.close()
+
+        # Skip parsing and embedding entirely if these exact bytes are known
+        digest = hasher.hexdigest()
+        existing_doc_id = kb.lookup_blob(digest)
+        if existing_doc_id:
+            return {"message": f"File '{file.filename}' was already in the knowledge base", "file_id": existing_doc_id}
+
+        # Drop finished jobs that were never polled before tracking a
+        # new one, so the registry cannot grow without bound
+        if len(upload_jobs) >= MAX_TRACKED_JOBS:
+            for job_id, job in list(upload_jobs.items()):
+                if job["status"] != "processing":
+                    del upload_jobs[job_id]
+
+        # Parsing and embedding run after the response; the request only
+        # pays for the read and the dedup check
+        upload_jobs[file_id] = {"status": "processing",
+                                "message": f"File '{file.filename}' is being processed"}
+        background_tasks.add_task(_ingest_job, file_id, file.filename, content, digest)
+
+        return {"message": f"File '{file.filename}' accepted for processing",
+                "file_id": file_id, "job_id": file_id}
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+@app.get("/status/{job_id}")
+async def upload_status(job_id: str):
+    job = upload_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    if job["status"] != "processing":
+        # Terminal states are reported once and then evicted
+        upload_jobs.pop(job_id, None)
+    return {"job_id": job_id, **job}
+
 @app.post("/chat")
-async def chat(question: dict):
+def chat(question: dict):
+    # Plain def: FastAPI runs this in its threadpool, so concurrent
+    # questions overlap (and can actually meet in the embedding batcher)
+    # instead of serializing future.result() on the event loop
+    user_question = question.get("question", "")
+    session_id = question.get("session_id", "default")
+
+    # Validate outside the blanket handler below, which would otherwise
+    # swallow these 400s and re-raise them as 500s
+    if not user_question:
+        raise HTTPException(status_code=400, detail="Question is required")
+
+    if len(user_question) > MAX_QUESTION_LENGTH:
+        raise HTTPException(status_code=400, detail="Question is too long")
+
     try:
-        user_question = question.get("question", "")
-        session_id = question.get("session_id", "default")
-        
-        if not user_question:
-            raise HTTPException(status_code=400, detail="Question is required")
-        
-        # Search for similar content
-        search_results = kb.search_similar_content(user_question)
+        # Short questions sharing no term with the corpus cannot
+        # retrieve anything useful; skip the encoder and fall through
+        # to the standard no-context answer
+        if kb.should_skip_retrieval(user_question):
+            search_results = {'documents': [], 'metadatas': [], 'scores': []}
+        else:
+            # Search for similar content; repeats of the same question hit
+            # the in-process cache instead of re-embedding. Collapsing inner
+            # whitespace folds retyped variants onto one cache entry.
+            search_results = _search_cached(kb.version, " ".join(user_question.lower().split()))
         
         # Build context
         context = "\n\n".join(search_results['documents']) if search_results['documents'] else ""
         
         # Generate answer
         answer = kb.generate_answer(user_question, context)
-        
+
         # Save to chat history
         kb.save_chat_message(session_id, user_question, answer, search_results['metadatas'])
-        
+
+        # Opt-in NDJSON streaming: the answer line goes out first so the
+        # client can render it while source records are still in flight
+        if question.get("stream"):
+            def ndjson():
+                yield orjson.dumps({"question": user_question, "answer": answer}) + b"\n"
+                for source in search_results['metadatas']:
+                    yield orjson.dumps({"source": source}) + b"\n"
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
         return {
             "question": user_question,
             "answer": answer,
             "sources": search_results['metadatas']
         }
-    
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing chat: {str(e)}")
 
+# Projected /documents rows; only change when the corpus does, so they
+# are rebuilt at most once per kb.version
+_docs_cache: Dict[str, Any] = {"version": -1, "rows": []}
+
+
+def _load_document_rows() -> List[Dict[str, Any]]:
+    """Fetch the listing with only the columns the frontend uses.
+
+    Projecting the columns keeps content_text (the whole document body)
+    out of the rows SQLite has to materialize.
+    """
+    cursor = get_db().cursor()
+    cursor.execute('''
+        SELECT id, filename, file_type, file_size, upload_date, chunk_count
+        FROM documents ORDER BY upload_date DESC
+    ''')
+    return [
+        {
+            "id": doc["id"],
+            "filename": doc["filename"],
+            "file_type": doc["file_type"],
+            "file_size": doc["file_size"],
+            "upload_date": doc["upload_date"],
+            "chunk_count": doc["chunk_count"]
+        }
+        for doc in cursor
+    ]
+
+
 @app.get("/documents")
-async def get_documents():
-    conn = sqlite3.connect('knowledge_chatbot.db')
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM documents ORDER BY upload_date DESC')
-    documents = cursor.fetchall()
-    conn.close()
-    
-    return {
-        "documents": [
-            {
-                "id": doc[0],
-                "filename": doc[1],
-                "file_type": doc[2],
-                "file_size": doc[3],
-                "upload_date": doc[6],
-                "chunk_count": doc[7]
-            }
-            for doc in documents
-        ]
-    }
+async def get_documents(request: Request, limit: int = 100, offset: int = 0):
+    if _docs_cache["version"] != kb.version:
+        # Run the query off the event loop so a cold cache does not
+        # stall other requests
+        _docs_cache["rows"] = await asyncio.to_thread(_load_document_rows)
+        _docs_cache["version"] = kb.version
+
+    limit = max(1, min(limit, 1000))
+    offset = max(0, offset)
+    etag = f'"docs-{kb.version}-{offset}-{limit}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    rows = _docs_cache["rows"]
+    body = orjson.dumps({
+        "documents": rows[offset:offset + limit],
+        "total": len(rows)
+    })
+    return Response(content=body, media_type="application/json",
+                    headers={"ETag": etag})
 
 @app.get("/health")
 async def health_check():
@@ -385,5 +1174,16 @@ if __name__ == "__main__":
     print("🔒 Upload access hidden behind 'S' in SolAI")
     print("🔑 Password required for uploads")
     print("⏹️  Press Ctrl+C to stop the server\n")
-    
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+
+    # Direct execution is for development; in production run
+    #   gunicorn -c gunicorn.conf.py app:app
+    # WEB_CONCURRENCY can scale this entrypoint to multiple workers, but
+    # see gunicorn.conf.py: ingest state lives in the process, so more
+    # than one worker is only safe when uploads are disabled.
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1"))
+    )
@@ -0,0 +1,24 @@
+"""Gunicorn configuration for production serving.
+
+Run with:
+    gunicorn -c gunicorn.conf.py app:app
+
+preload_app imports the application (and therefore the embedding model
+weights) once in the master process before forking, so workers share
+them copy-on-write instead of each loading their own copy.
+
+The default is a single worker because the knowledge base keeps mutable
+state in the process: the in-memory chunk/embedding matrix, the ingest
+lock that guarantees embeddings.i8 row order matches chunks.id order,
+and the upload job registry behind /status. With several workers each
+holds its own copy — concurrent ingest can interleave sidecar appends,
+documents ingested by one worker stay invisible to the others until
+restart, and /status 404s on the wrong worker. Raise WEB_CONCURRENCY
+only if uploads are disabled or ingest is moved out of process.
+"""
+import os
+
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+preload_app = True
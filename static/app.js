@@ -0,0 +1,400 @@
+class SolAI {
+    constructor() {
+        this.baseUrl = window.location.origin;
+        this.sessionId = this.getSessionId();
+        this.initializeEventListeners();
+        this.setupAutoResize();
+    }
+
+    getSessionId() {
+        let sessionId = localStorage.getItem('solai_session_id');
+        if (!sessionId) {
+            sessionId = 'session_' + Date.now() + '_' + Math.random().toString(36).substr(2, 9);
+            localStorage.setItem('solai_session_id', sessionId);
+        }
+        return sessionId;
+    }
+
+    initializeEventListeners() {
+        // Upload modal
+        document.getElementById('logoS').addEventListener('click', () => this.showUploadModal());
+        document.getElementById('closeModal').addEventListener('click', () => this.hideUploadModal());
+        document.getElementById('uploadModal').addEventListener('click', (e) => {
+            if (e.target.id === 'uploadModal') this.hideUploadModal();
+        });
+
+        // Password verification
+        document.getElementById('passwordInput').addEventListener('input', (e) => {
+            this.verifyPassword(e.target.value);
+        });
+
+        // File upload
+        const uploadArea = document.getElementById('uploadArea');
+        const fileInput = document.getElementById('fileInput');
+        const uploadBtn = document.getElementById('uploadBtn');
+
+        uploadArea.addEventListener('click', () => fileInput.click());
+        uploadArea.addEventListener('dragover', (e) => {
+            e.preventDefault();
+            uploadArea.style.borderColor = 'var(--accent-green)';
+            uploadArea.style.background = 'var(--bg-tertiary)';
+        });
+        uploadArea.addEventListener('dragleave', () => {
+            uploadArea.style.borderColor = 'var(--border-color)';
+            uploadArea.style.background = 'transparent';
+        });
+        uploadArea.addEventListener('drop', (e) => {
+            e.preventDefault();
+            uploadArea.style.borderColor = 'var(--border-color)';
+            uploadArea.style.background = 'transparent';
+            fileInput.files = e.dataTransfer.files;
+            this.updateUploadButton();
+        });
+
+        fileInput.addEventListener('change', () => this.updateUploadButton());
+        uploadBtn.addEventListener('click', () => this.uploadFiles());
+
+        // Chat
+        const chatInput = document.getElementById('chatInput');
+        const sendBtn = document.getElementById('sendBtn');
+
+        chatInput.addEventListener('keydown', (e) => {
+            if (e.key === 'Enter' && !e.shiftKey) {
+                e.preventDefault();
+                this.sendMessage();
+            }
+        });
+
+        sendBtn.addEventListener('click', () => this.sendMessage());
+
+        // New chat
+        document.getElementById('newChat').addEventListener('click', () => this.newChat());
+    }
+
+    setupAutoResize() {
+        const textarea = document.getElementById('chatInput');
+        textarea.addEventListener('input', function() {
+            this.style.height = 'auto';
+            this.style.height = Math.min(this.scrollHeight, 120) + 'px';
+        });
+    }
+
+    showUploadModal() {
+        document.getElementById('uploadModal').style.display = 'flex';
+        document.getElementById('passwordInput').focus();
+    }
+
+    hideUploadModal() {
+        document.getElementById('uploadModal').style.display = 'none';
+        this.resetUploadModal();
+    }
+
+    resetUploadModal() {
+        document.getElementById('passwordInput').value = '';
+        document.getElementById('fileInput').value = '';
+        document.getElementById('uploadArea').classList.remove('active');
+        document.getElementById('uploadBtn').classList.remove('active');
+        document.getElementById('uploadBtn').disabled = true;
+        this.hideProgressBar();
+    }
+
+    verifyPassword(password) {
+        const uploadArea = document.getElementById('uploadArea');
+        const uploadBtn = document.getElementById('uploadBtn');
+        
+        if (password === 'Henley@2003') {
+            uploadArea.classList.add('active');
+            uploadBtn.classList.add('active');
+        } else {
+            uploadArea.classList.remove('active');
+            uploadBtn.classList.remove('active');
+            uploadBtn.disabled = true;
+        }
+    }
+
+    updateUploadButton() {
+        const fileInput = document.getElementById('fileInput');
+        const uploadBtn = document.getElementById('uploadBtn');
+        uploadBtn.disabled = fileInput.files.length === 0;
+    }
+
+    async uploadFiles() {
+        const fileInput = document.getElementById('fileInput');
+        const files = Array.from(fileInput.files);
+        const uploadBtn = document.getElementById('uploadBtn');
+        const progressBar = document.getElementById('progressBar');
+        const progressFill = document.getElementById('progressFill');
+
+        if (files.length === 0) return;
+
+        uploadBtn.disabled = true;
+        uploadBtn.textContent = 'Uploading...';
+        this.showProgressBar();
+        progressFill.style.width = '0%';
+
+        let uploadedCount = 0;
+
+        try {
+            // Upload up to 6 files concurrently instead of serializing
+            // each request end-to-end
+            const queue = [...files];
+            const limit = Math.min(6, queue.length);
+            const workers = Array.from({length: limit}, async () => {
+                while (queue.length > 0) {
+                    const file = queue.shift();
+                    const result = await this.uploadSingleFile(file);
+                    uploadedCount++;
+                    progressFill.style.width = `${(uploadedCount / files.length) * 100}%`;
+
+                    if (result.message.includes('already in the knowledge base')) {
+                        this.showNotification(`${file.name} - Already exists`, 'success');
+                    } else {
+                        this.showNotification(`Processed ${file.name} successfully`, 'success');
+                    }
+                }
+            });
+            await Promise.all(workers);
+
+            this.hideUploadModal();
+            this.showNotification('All files uploaded successfully!', 'success');
+
+        } catch (error) {
+            console.error('Upload error:', error);
+            this.showNotification(`Upload failed: ${error.message}`, 'error');
+        } finally {
+            uploadBtn.disabled = false;
+            uploadBtn.textContent = 'Upload Selected Files';
+            setTimeout(() => {
+                this.hideProgressBar();
+            }, 1000);
+        }
+    }
+
+    async uploadSingleFile(file) {
+        const formData = new FormData();
+        formData.append('file', file);
+        formData.append('password', 'Henley@2003');
+
+        const response = await fetch(`${this.baseUrl}/upload`, {
+            method: 'POST',
+            body: formData
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.detail || `Upload failed for ${file.name}`);
+        }
+
+        const result = await response.json();
+        if (result.job_id) {
+            return this.waitForProcessing(result.job_id, file.name);
+        }
+        return result;
+    }
+
+    async waitForProcessing(jobId, filename) {
+        // The upload response only means the file was accepted; poll
+        // until background parsing/embedding finishes so failures are
+        // surfaced instead of silently dropped
+        for (let attempt = 0; attempt < 120; attempt++) {
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            const response = await fetch(`${this.baseUrl}/status/${jobId}`);
+            if (!response.ok) {
+                throw new Error(`Lost track of processing for ${filename}`);
+            }
+            const status = await response.json();
+            if (status.status === 'done') {
+                return status;
+            }
+            if (status.status === 'failed') {
+                throw new Error(status.message || `Processing failed for ${filename}`);
+            }
+        }
+        throw new Error(`Timed out waiting for ${filename} to finish processing`);
+    }
+
+    showProgressBar() {
+        document.getElementById('progressBar').style.display = 'block';
+    }
+
+    hideProgressBar() {
+        document.getElementById('progressBar').style.display = 'none';
+    }
+
+    async sendMessage() {
+        const chatInput = document.getElementById('chatInput');
+        const message = chatInput.value.trim();
+
+        if (!message) return;
+
+        // Add user message to chat
+        this.addMessage(message, 'user');
+
+        // Clear and reset input
+        chatInput.value = '';
+        chatInput.style.height = 'auto';
+
+        // Show typing indicator
+        this.showTypingIndicator();
+
+        try {
+            const response = await fetch(`${this.baseUrl}/chat`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    question: message,
+                    session_id: this.sessionId
+                })
+            });
+
+            if (!response.ok) {
+                throw new Error('Chat request failed');
+            }
+
+            const data = await response.json();
+            
+            this.removeTypingIndicator();
+            this.addMessage(data.answer, 'bot', data.sources);
+
+        } catch (error) {
+            console.error('Chat error:', error);
+            this.removeTypingIndicator();
+            this.addMessage('Sorry, I encountered an error while processing your request. Please try again.', 'bot');
+        }
+    }
+
+    addMessage(content, sender, sources = null) {
+        const chatMessages = document.getElementById('chatMessages');
+        
+        // Remove welcome message if it's the first real message
+        const welcomeMessage = chatMessages.querySelector('.welcome-message');
+        if (welcomeMessage && sender === 'user') {
+            welcomeMessage.remove();
+        }
+
+        const messageDiv = document.createElement('div');
+        messageDiv.className = `message message-${sender}`;
+
+        const avatar = document.createElement('div');
+        avatar.className = 'avatar';
+        avatar.textContent = sender === 'user' ? 'Y' : 'S';
+
+        const messageContent = document.createElement('div');
+        messageContent.className = 'message-content';
+
+        const messageText = document.createElement('div');
+        messageText.className = 'message-text';
+        messageText.textContent = content;
+
+        const messageTime = document.createElement('div');
+        messageTime.className = 'message-time';
+        messageTime.textContent = new Date().toLocaleTimeString([], {hour: '2-digit', minute:'2-digit'});
+
+        messageContent.appendChild(messageText);
+        messageContent.appendChild(messageTime);
+
+        // Add sources if available
+        if (sources && sources.length > 0 && sender === 'bot') {
+            const sourcesDiv = document.createElement('div');
+            sourcesDiv.className = 'sources';
+            
+            const sourcesTitle = document.createElement('h4');
+            sourcesTitle.textContent = 'Sources:';
+            sourcesDiv.appendChild(sourcesTitle);
+
+            // Build all source rows off-DOM and append once to avoid
+            // one layout pass per row
+            const fragment = document.createDocumentFragment();
+            const uniqueFiles = [...new Set(sources.map(source => source.filename))];
+            uniqueFiles.forEach(filename => {
+                const sourceItem = document.createElement('div');
+                sourceItem.className = 'source-item';
+                sourceItem.textContent = filename || 'Document';
+                fragment.appendChild(sourceItem);
+            });
+            sourcesDiv.appendChild(fragment);
+
+            messageContent.appendChild(sourcesDiv);
+        }
+
+        messageDiv.appendChild(avatar);
+        messageDiv.appendChild(messageContent);
+        chatMessages.appendChild(messageDiv);
+
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+
+    showTypingIndicator() {
+        const chatMessages = document.getElementById('chatMessages');
+        
+        const typingDiv = document.createElement('div');
+        typingDiv.className = 'message message-bot';
+        typingDiv.id = 'typing-indicator';
+
+        const avatar = document.createElement('div');
+        avatar.className = 'avatar';
+        avatar.textContent = 'S';
+
+        const typingContent = document.createElement('div');
+        typingContent.className = 'typing-indicator';
+
+        const typingDots = document.createElement('div');
+        typingDots.className = 'typing-dots';
+        typingDots.innerHTML = `
+            <div class="typing-dot"></div>
+            <div class="typing-dot"></div>
+            <div class="typing-dot"></div>
+        `;
+
+        typingContent.appendChild(typingDots);
+        typingDiv.appendChild(avatar);
+        typingDiv.appendChild(typingContent);
+        chatMessages.appendChild(typingDiv);
+
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+
+    removeTypingIndicator() {
+        const typingIndicator = document.getElementById('typing-indicator');
+        if (typingIndicator) {
+            typingIndicator.remove();
+        }
+    }
+
+    newChat() {
+        this.sessionId = 'session_' + Date.now() + '_' + Math.random().toString(36).substr(2, 9);
+        localStorage.setItem('solai_session_id', this.sessionId);
+        this.clearChat();
+        this.showNotification('New chat started', 'success');
+    }
+
+    clearChat() {
+        const chatMessages = document.getElementById('chatMessages');
+        chatMessages.innerHTML = `
+            <div class="welcome-message">
+                <h3>Welcome to SolAI</h3>
+                <p>I'm your personal AI assistant powered by your knowledge base.</p>
+                <p>Ask me anything about the content you've uploaded!</p>
+            </div>
+        `;
+    }
+
+    showNotification(message, type = 'info') {
+        const notification = document.createElement('div');
+        notification.className = `notification notification-${type}`;
+        notification.textContent = message;
+
+        document.body.appendChild(notification);
+
+        setTimeout(() => {
+            notification.remove();
+        }, 3000);
+    }
+}
+
+// Initialize the app when DOM is loaded
+document.addEventListener('DOMContentLoaded', () => {
+    new SolAI();
+});